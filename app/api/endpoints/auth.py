@@ -5,13 +5,14 @@ from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.db.session import get_db
+from app.core.profiling import ProfiledRoute
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password, create_access_token
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
 
 limiter = Limiter(key_func=get_remote_address)
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
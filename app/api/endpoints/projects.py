@@ -2,12 +2,13 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db.session import get_db
+from app.core.profiling import ProfiledRoute
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.project import Project, ProjectMember
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectWithMembersResponse, ProjectMemberCreate
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(project_in: ProjectCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -2,6 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from app.db.session import get_db
+from app.core.profiling import ProfiledRoute
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.project import Project, ProjectMember
@@ -10,7 +11,7 @@ from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate, TaskStatusUpd
 from app.core.websocket import manager
 import asyncio
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 def check_project_membership(db: Session, project_id: int, user_id: int):
     project = db.query(Project).filter(Project.id == project_id).first()
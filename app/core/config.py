@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,6 +9,14 @@ class Settings(BaseSettings):
     
     # Database
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./peroxia.db"
+    DB_SCHEMA_MODE: Literal["create", "check", "off"] = "create"
+
+    # Pre-open DB connections and load bcrypt/JWT backends at startup
+    STARTUP_WARMUP: bool = True
+
+    # Profiling (Server-Timing header + slow request log)
+    PROFILING_ENABLED: bool = False
+    SLOW_REQUEST_THRESHOLD_MS: int = 500
 
     class Config:
         case_sensitive = True
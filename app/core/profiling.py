@@ -0,0 +1,243 @@
+import functools
+import inspect
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Profile of the request currently being handled. Stays None unless the
+# profiling middleware is installed, so the hooks below are a single lookup.
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """
+    Exclusive per-phase timings of a single request. Time spent in a nested
+    phase or SQL query is subtracted from the enclosing phase, so the phases
+    always add up to the total. Whatever isn't attributed to a named phase
+    lands in the root `app` phase.
+    """
+    def __init__(self):
+        # Key: phase name, Value: accumulated exclusive seconds
+        self.phases: Dict[str, float] = {}
+        self.queries: List[dict] = []
+        self.total = 0.0
+        # Active phases, innermost last: [name, start, seconds spent in nested phases]
+        self._stack: List[list] = []
+        self.enter("app")
+
+    def enter(self, phase: str):
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def exit(self) -> float:
+        phase, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.add(phase, elapsed - nested)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        return elapsed
+
+    def finish(self):
+        # Close phases left open by an exception, then the root phase
+        while len(self._stack) > 1:
+            self.exit()
+        if self._stack:
+            self.total = self.exit()
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record_query(self, statement: str, seconds: float, error: Optional[str] = None):
+        self.add("db", seconds)
+        if self._stack:
+            self._stack[-1][2] += seconds
+        query = {"statement": statement, "duration_ms": round(seconds * 1000, 3)}
+        if error:
+            query["error"] = error
+        self.queries.append(query)
+
+    def server_timing(self) -> str:
+        parts = []
+        for phase, seconds in self.phases.items():
+            entry = f"{phase};dur={seconds * 1000:.2f}"
+            if phase == "db":
+                entry += f';desc="{len(self.queries)} queries"'
+            parts.append(entry)
+        parts.append(f"total;dur={self.total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def profile_phase(name: str):
+    """
+    Attribute the time spent in the block to `name` on the current request profile.
+    No-op when profiling is disabled.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    profile.enter(name)
+    try:
+        yield
+    finally:
+        profile.exit()
+
+
+class ProfiledRoute(APIRoute):
+    """
+    While a request is being profiled, validates and encodes the response model
+    inside the `serialize` phase (including any ORM lazy loads it triggers,
+    which are still counted as `db`). Otherwise defers to FastAPI's own
+    serialization untouched.
+    """
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, self._wrap_endpoint(endpoint), **kwargs)
+        self._response_adapter = TypeAdapter(self.response_model) if self.response_model else None
+
+    def _wrap_endpoint(self, endpoint):
+        # Keep the endpoint's sync/async nature so FastAPI still runs sync ones in the threadpool
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                return self._encode(await endpoint(*args, **kwargs))
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                return self._encode(endpoint(*args, **kwargs))
+        return wrapper
+
+    def _encode(self, content):
+        if self._response_adapter is None or isinstance(content, Response) or _current_profile.get() is None:
+            return content
+        with profile_phase("serialize"):
+            value = self._response_adapter.validate_python(content, from_attributes=True)
+            body = self._response_adapter.dump_json(value, by_alias=True)
+        return Response(content=body, status_code=self.status_code or 200, media_type="application/json")
+
+
+class ProfiledSession(Session):
+    """
+    Session that, while a request is being profiled, counts everything it
+    does against the database as `db`: pool checkout and connecting (which
+    happen lazily inside the first execute), statements, flushes, and the
+    COMMIT/ROLLBACK themselves, which never reach the cursor events.
+    """
+    def execute(self, *args, **kwargs):
+        if _current_profile.get() is None:
+            return super().execute(*args, **kwargs)
+        with profile_phase("db"):
+            return super().execute(*args, **kwargs)
+
+    def flush(self, *args, **kwargs):
+        if _current_profile.get() is None:
+            return super().flush(*args, **kwargs)
+        with profile_phase("db"):
+            return super().flush(*args, **kwargs)
+
+    def commit(self):
+        if _current_profile.get() is None:
+            return super().commit()
+        with profile_phase("db"):
+            return super().commit()
+
+    def rollback(self):
+        if _current_profile.get() is None:
+            return super().rollback()
+        with profile_phase("db"):
+            return super().rollback()
+
+    def close(self):
+        # Returning the connection to the pool resets (rolls back) it
+        if _current_profile.get() is None:
+            return super().close()
+        with profile_phase("db"):
+            return super().close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    starts = conn.info.get("query_start_time")
+    if profile is None or not starts:
+        return
+    # Parameters are deliberately not recorded, they may hold credentials
+    profile.record_query(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute doesn't fire for a failing statement; drop its start
+    # time so it doesn't linger on the pooled connection, and record the failure
+    conn = exception_context.connection
+    starts = conn.info.get("query_start_time") if conn is not None else None
+    if exception_context.statement is None or not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        error = type(exception_context.original_exception).__name__
+        profile.record_query(exception_context.statement, seconds, error=error)
+
+
+def _log_slow_request(request: Request, status_code: int, profile: RequestProfile):
+    if profile.total * 1000 < settings.SLOW_REQUEST_THRESHOLD_MS:
+        return
+    record = {
+        "event": "slow_request",
+        "method": request.method,
+        "path": request.url.path,
+        "status_code": status_code,
+        "duration_ms": round(profile.total * 1000, 3),
+        "threshold_ms": settings.SLOW_REQUEST_THRESHOLD_MS,
+        "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in profile.phases.items()},
+        "queries": profile.queries,
+    }
+    logger.warning(json.dumps(record))
+
+
+def install_profiling(app: FastAPI, engine: Engine):
+    """
+    Time auth, DB, serialization and broadcast phases of every HTTP request,
+    report them in a `Server-Timing` header and log requests slower than
+    SLOW_REQUEST_THRESHOLD_MS.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = await call_next(request)
+        except Exception:
+            # Unhandled errors are the slow requests most worth seeing
+            profile.finish()
+            _log_slow_request(request, 500, profile)
+            raise
+        finally:
+            _current_profile.reset(token)
+        profile.finish()
+        response.headers["Server-Timing"] = profile.server_timing()
+        _log_slow_request(request, response.status_code, profile)
+        return response
+
@@ -22,3 +22,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def warmup():
+    """
+    Load the bcrypt backend and exercise the JWT encode/decode path once,
+    so the first login or authenticated request doesn't pay for it.
+    """
+    pwd_context.handler("bcrypt").get_backend()
+    token = create_access_token({"sub": "warmup"})
+    jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
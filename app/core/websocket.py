@@ -1,5 +1,6 @@
 from fastapi import WebSocket
 from typing import Dict, List
+from app.core.profiling import profile_phase
 
 class ConnectionManager:
     def __init__(self):
@@ -22,7 +23,9 @@ class ConnectionManager:
                 del self.active_connections[project_id]
 
     async def broadcast(self, message: dict, project_id: int):
-        if project_id in self.active_connections:
+        if project_id not in self.active_connections:
+            return
+        with profile_phase("broadcast"):
             # Create a copy of the list to handle potential disconnections during iteration
             for connection in list(self.active_connections[project_id]):
                 try:
@@ -31,4 +34,15 @@ class ConnectionManager:
                     print(f"Error broadcasting to a client in room {project_id}: {e}")
                     self.disconnect(connection, project_id)
 
+    async def close_all(self, code: int = 1001):
+        # Called on lifespan shutdown. Uvicorn has already closed its sockets (1012) by then;
+        # this closes whatever is still registered, e.g. under TestClient or other servers
+        for project_id, connections in list(self.active_connections.items()):
+            for connection in list(connections):
+                try:
+                    await connection.close(code=code)
+                except Exception as e:
+                    print(f"Error closing a client in room {project_id}: {e}")
+        self.active_connections.clear()
+
 manager = ConnectionManager()
@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.config import settings
+from app.core.profiling import ProfiledSession
 
 # SQLite specifically requires check_same_thread=False for FastAPI
 connect_args = {"check_same_thread": False} if settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite") else {}
@@ -10,7 +11,7 @@ engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI, connect_args=connect_args
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=ProfiledSession)
 
 Base = declarative_base()
 
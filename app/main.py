@@ -1,37 +1,88 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.profiling import install_profiling
+from app.core.security import warmup as warmup_security
+from app.core.websocket import manager
 from app.db.session import engine, Base
 from app.api.endpoints import auth, projects, tasks, websockets
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title=settings.PROJECT_NAME)
-
 # Rate Limiter setup
 limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# CORS config
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins in development
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include Routers
-app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
-app.include_router(projects.router, prefix=f"{settings.API_V1_STR}/projects", tags=["projects"])
-app.include_router(tasks.router, prefix=f"{settings.API_V1_STR}", tags=["tasks"])
-app.include_router(websockets.router, prefix="/ws", tags=["websockets"])
-
-@app.get("/")
-def root():
-    return {"message": "Welcome to Peroxia Technology Backend API"}
+
+def prepare_schema():
+    """
+    Create or verify the database tables according to DB_SCHEMA_MODE.
+    """
+    if settings.DB_SCHEMA_MODE == "create":
+        Base.metadata.create_all(bind=engine)
+    elif settings.DB_SCHEMA_MODE == "check":
+        existing = set(inspect(engine).get_table_names())
+        missing = sorted(set(Base.metadata.tables) - existing)
+        if missing:
+            raise RuntimeError(f"Database schema is missing tables: {', '.join(missing)}")
+    elif settings.DB_SCHEMA_MODE != "off":
+        raise ValueError(f"Unknown DB_SCHEMA_MODE: {settings.DB_SCHEMA_MODE!r}")
+
+def warmup_pool():
+    # Check out as many connections as the pool keeps so the first requests don't pay for connecting
+    # Only QueuePool has a size() method; SingletonThreadPool (in-memory SQLite) stores an int
+    size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    connections = [engine.connect() for _ in range(size)]
+    try:
+        for conn in connections:
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prepare_schema()
+    if settings.STARTUP_WARMUP:
+        warmup_pool()
+        warmup_security()
+    yield
+    await manager.close_all()
+    engine.dispose()
+
+def create_app() -> FastAPI:
+    app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    # CORS config
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allows all origins in development
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Per-request profiling (opt-in)
+    if settings.PROFILING_ENABLED:
+        install_profiling(app, engine)
+
+    # Include Routers
+    app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
+    app.include_router(projects.router, prefix=f"{settings.API_V1_STR}/projects", tags=["projects"])
+    app.include_router(tasks.router, prefix=f"{settings.API_V1_STR}", tags=["tasks"])
+    app.include_router(websockets.router, prefix="/ws", tags=["websockets"])
+
+    @app.get("/")
+    def root():
+        return {"message": "Welcome to Peroxia Technology Backend API"}
+
+    return app
+
+# Module-level app for `uvicorn app.main:app`. Building it does no DB work;
+# schema and warmup run in the lifespan handler.
+app = create_app()
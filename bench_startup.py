@@ -0,0 +1,66 @@
+"""
+Startup benchmark: cold import of app.main, lifespan startup and first-request latency.
+
+Each run happens in a fresh interpreter against a throwaway SQLite database:
+    python bench_startup.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = r"""
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(app.main.app)
+t2 = time.perf_counter()
+client.__enter__()  # runs the lifespan startup
+t3 = time.perf_counter()
+client.get("/")
+t4 = time.perf_counter()
+r = client.post("/api/v1/auth/signup", json={"email": "bench@example.com", "username": "bench", "password": "password123"})
+t5 = time.perf_counter()
+assert r.status_code == 201, f"signup failed: {r.status_code} {r.text}"
+r = client.post("/api/v1/auth/login", data={"username": "bench", "password": "password123"})
+t6 = time.perf_counter()
+assert r.status_code == 200, f"login failed: {r.status_code} {r.text}"
+r = client.get("/api/v1/projects/", headers={"Authorization": f"Bearer {r.json()['access_token']}"})
+t7 = time.perf_counter()
+assert r.status_code == 200, f"projects failed: {r.status_code} {r.text}"
+client.__exit__(None, None, None)
+print(json.dumps({
+    "import": t1 - t0,
+    "startup": t3 - t2,
+    "first GET /": t4 - t3,
+    "first signup": t5 - t4,
+    "first login": t6 - t5,
+    "first authed GET": t7 - t6,
+}))
+"""
+
+def run_once(extra_env: dict) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=ROOT, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp}/bench.db", **extra_env)
+        out = subprocess.run([sys.executable, "-c", CHILD], cwd=tmp, env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            sys.exit(f"benchmark run failed:\n{out.stderr}")
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for label, env in [("warmup on", {"STARTUP_WARMUP": "true"}), ("warmup off", {"STARTUP_WARMUP": "false"})]:
+        results = [run_once(env) for _ in range(runs)]
+        print(f"\n{label} (median of {runs} runs)")
+        for phase in results[0]:
+            median = statistics.median(r[phase] for r in results)
+            print(f"  {phase:<18} {median * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before anything imports app.core.config
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+import uuid
+import pytest
+from app.api.endpoints import auth
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limit():
+    auth.limiter.enabled = False
+    yield
+    auth.limiter.enabled = True
+
+
+@pytest.fixture
+def signup_and_login():
+    def _signup_and_login(client):
+        username = f"user_{uuid.uuid4().hex[:8]}"
+        r = client.post("/api/v1/auth/signup", json={"email": f"{username}@example.com", "username": username, "password": "password123"})
+        assert r.status_code == 201
+        r = client.post("/api/v1/auth/login", data={"username": username, "password": "password123"})
+        assert r.status_code == 200
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+    return _signup_and_login
@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from starlette.websockets import WebSocketDisconnect
+import app.main
+from app.core.config import Settings, settings
+from app.core.websocket import manager
+from app.main import create_app, lifespan, prepare_schema
+
+
+@pytest.fixture
+def empty_engine(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/empty.db")
+    monkeypatch.setattr(app.main, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_import_does_no_db_work(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "SQLALCHEMY_DATABASE_URI"}
+    env["PYTHONPATH"] = os.path.dirname(os.path.abspath(__file__))
+    subprocess.run([sys.executable, "-c", "import app.main"], cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "peroxia.db").exists()
+
+
+def test_schema_mode_create(monkeypatch, empty_engine):
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "create")
+    prepare_schema()
+    assert {"users", "projects", "project_members", "tasks"} <= set(inspect(empty_engine).get_table_names())
+
+
+def test_schema_mode_check(monkeypatch, empty_engine):
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "check")
+    with pytest.raises(RuntimeError, match="missing tables"):
+        prepare_schema()
+
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "create")
+    prepare_schema()
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "check")
+    prepare_schema()
+
+
+def test_schema_mode_off(monkeypatch, empty_engine):
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "off")
+    prepare_schema()
+    assert inspect(empty_engine).get_table_names() == []
+
+
+def test_schema_mode_invalid(monkeypatch):
+    with pytest.raises(ValueError):
+        Settings(DB_SCHEMA_MODE="creat")
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "creat")
+    with pytest.raises(ValueError, match="Unknown DB_SCHEMA_MODE"):
+        prepare_schema()
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_startup_warmup(monkeypatch, enabled):
+    calls = []
+    monkeypatch.setattr(settings, "STARTUP_WARMUP", enabled)
+    monkeypatch.setattr(app.main, "warmup_pool", lambda: calls.append("pool"))
+    monkeypatch.setattr(app.main, "warmup_security", lambda: calls.append("security"))
+    with TestClient(create_app()) as client:
+        assert client.get("/").status_code == 200
+    assert calls == (["pool", "security"] if enabled else [])
+
+
+def test_warmup_functions_run():
+    app.main.warmup_pool()
+    app.main.warmup_security()
+
+
+def test_startup_with_in_memory_sqlite(monkeypatch):
+    # sqlite:// uses SingletonThreadPool rather than QueuePool
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(app.main, "engine", engine)
+    monkeypatch.setattr(settings, "STARTUP_WARMUP", True)
+    with TestClient(create_app()) as client:
+        assert client.get("/").status_code == 200
+        # Each thread gets its own in-memory database; look from the thread the lifespan ran on
+        assert "users" in client.portal.call(lambda: inspect(engine).get_table_names())
+
+
+def test_shutdown_closes_open_websockets(signup_and_login):
+    application = create_app()
+    with TestClient(application) as client:
+        headers = signup_and_login(client)
+        project_id = client.post("/api/v1/projects/", json={"name": "Rooms"}, headers=headers).json()["id"]
+    token = headers["Authorization"].split()[1]
+
+    async def run_lifespan():
+        async with lifespan(application):
+            pass
+
+    with TestClient(application).websocket_connect(f"/ws/projects/{project_id}?token={token}") as ws:
+        assert project_id in manager.active_connections
+        # Run the lifespan on the WebSocket session's own event loop
+        ws.portal.call(run_lifespan)
+        assert manager.active_connections == {}
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_text()
+        assert exc.value.code == 1001
@@ -0,0 +1,164 @@
+import json
+import logging
+import time
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core import profiling
+from app.core.config import settings
+from app.core.profiling import RequestProfile, profile_phase
+from app.db.session import engine, get_db
+from app.main import create_app
+
+
+def parse_server_timing(header):
+    timings = {}
+    for entry in header.split(", "):
+        name, dur = entry.split(";")[:2]
+        timings[name] = float(dur[len("dur="):])
+    return timings
+
+
+def remove_engine_listeners():
+    if event.contains(engine, "before_cursor_execute", profiling._before_cursor_execute):
+        event.remove(engine, "before_cursor_execute", profiling._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", profiling._after_cursor_execute)
+        event.remove(engine, "handle_error", profiling._handle_error)
+
+
+@pytest.fixture
+def profiled_app(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 0)
+    yield create_app()
+    remove_engine_listeners()
+
+
+def test_phases_are_exclusive(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(profiling.time, "perf_counter", lambda: now[0])
+
+    profile = RequestProfile()
+    token = profiling._current_profile.set(profile)
+    try:
+        now[0] = 1.0
+        with profile_phase("serialize"):
+            now[0] = 2.0
+            with profile_phase("auth"):
+                now[0] = 3.0
+            # A lazy load running during serialization
+            profile.record_query("SELECT 1", 3.0)
+            now[0] = 7.0
+        now[0] = 10.0
+        profile.finish()
+    finally:
+        profiling._current_profile.reset(token)
+
+    assert profile.phases == {"auth": 1.0, "db": 3.0, "serialize": 2.0, "app": 4.0}
+    assert profile.total == 10.0
+    assert sum(profile.phases.values()) == profile.total
+
+
+def test_server_timing_header(profiled_app, signup_and_login):
+    with TestClient(profiled_app) as client:
+        headers = signup_and_login(client)
+        r = client.post("/api/v1/projects/", json={"name": "Timed"}, headers=headers)
+
+    assert r.status_code == 201
+    assert r.json()["name"] == "Timed"
+    assert 'desc="' in r.headers["Server-Timing"]
+    timings = parse_server_timing(r.headers["Server-Timing"])
+    assert {"auth", "db", "serialize", "app", "total"} <= set(timings)
+    phases = sum(dur for name, dur in timings.items() if name != "total")
+    # Each value is rounded to 0.01ms in the header
+    assert phases == pytest.approx(timings["total"], abs=0.01 * len(timings))
+
+
+def test_commit_counts_as_db(profiled_app, signup_and_login):
+    # The "commit" event fires inside Session.commit, before the DBAPI commit
+    def slow_commit(conn):
+        time.sleep(0.05)
+
+    with TestClient(profiled_app) as client:
+        headers = signup_and_login(client)
+        event.listen(engine, "commit", slow_commit)
+        try:
+            r = client.post("/api/v1/projects/", json={"name": "Committed"}, headers=headers)
+        finally:
+            event.remove(engine, "commit", slow_commit)
+
+    assert r.status_code == 201
+    timings = parse_server_timing(r.headers["Server-Timing"])
+    # create_project commits twice
+    assert timings["db"] >= 100
+    assert timings["app"] < 50
+
+
+def test_failed_statement_is_recorded(profiled_app, caplog):
+    def broken(db: Session = Depends(get_db)):
+        try:
+            db.execute(text("SELECT * FROM missing_table"))
+        except OperationalError:
+            pass
+        return {"pending": len(db.connection().info.get("query_start_time", []))}
+    profiled_app.add_api_route("/broken", broken)
+
+    with TestClient(profiled_app) as client:
+        with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+            r = client.get("/broken")
+
+    assert r.json() == {"pending": 0}
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.core.profiling"]
+    queries = [q for rec in records if rec["path"] == "/broken" for q in rec["queries"]]
+    assert {"statement": "SELECT * FROM missing_table", "error": "OperationalError"}.items() <= queries[0].items()
+
+
+def test_slow_request_log(profiled_app, signup_and_login, caplog):
+    with TestClient(profiled_app) as client:
+        headers = signup_and_login(client)
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+            client.post("/api/v1/projects/", json={"name": "Do not log me"}, headers=headers)
+
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.core.profiling"]
+    assert len(records) == 1
+    record = records[0]
+    assert record["event"] == "slow_request"
+    assert record["method"] == "POST"
+    assert record["path"] == "/api/v1/projects/"
+    assert record["status_code"] == 201
+    assert any(q["statement"].startswith("INSERT INTO projects") for q in record["queries"])
+    assert "Do not log me" not in caplog.text
+
+
+def test_slow_request_log_on_unhandled_error(profiled_app, caplog):
+    def boom():
+        raise RuntimeError("boom")
+    profiled_app.add_api_route("/boom", boom)
+
+    with TestClient(profiled_app, raise_server_exceptions=False) as client:
+        with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+            r = client.get("/boom")
+
+    assert r.status_code == 500
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.core.profiling"]
+    assert [(rec["path"], rec["status_code"]) for rec in records] == [("/boom", 500)]
+
+
+def test_disabled_installs_nothing(monkeypatch, signup_and_login):
+    remove_engine_listeners()
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", False)
+    app = create_app()
+
+    assert not any(m.cls is BaseHTTPMiddleware for m in app.user_middleware)
+    assert not event.contains(engine, "before_cursor_execute", profiling._before_cursor_execute)
+    with TestClient(app) as client:
+        headers = signup_and_login(client)
+        r = client.post("/api/v1/projects/", json={"name": "Untimed"}, headers=headers)
+    assert r.status_code == 201
+    assert r.json()["name"] == "Untimed"
+    assert "Server-Timing" not in r.headers